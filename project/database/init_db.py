@@ -121,8 +121,8 @@ def create_sample_data():
         volunteer = Volunteer(
             user_id=user.id,
             bio=f'Passionate volunteer with experience in {", ".join(vol_data["interests"])}',
-            skills=json.dumps(vol_data['skills']),
-            interests=json.dumps(vol_data['interests']),
+            skills=vol_data['skills'],
+            interests=vol_data['interests'],
             availability=json.dumps({
                 'monday': ['09:00-12:00', '14:00-17:00'],
                 'tuesday': ['09:00-12:00', '14:00-17:00'],
@@ -217,13 +217,14 @@ def create_sample_data():
         ngo = NGO.query.filter_by(organization_name=ngo_organizations[event_info['ngo_index']]['name']).first()
         event = Event(
             ngo_id=ngo.id,
+            organization_name=ngo.organization_name,
             title=event_info['title'],
             description=event_info['description'],
             location=f'{ngo.city}, {ngo.state}',
             start_date=event_info['start_date'],
             end_date=event_info['end_date'],
             max_volunteers=event_info['max_volunteers'],
-            required_skills=json.dumps(event_info['required_skills']),
+            required_skills=event_info['required_skills'],
             category=event_info['category'],
             status='active'
         )
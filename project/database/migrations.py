@@ -4,23 +4,78 @@ Database Migration System
 Handles database schema changes and versioning
 """
 
+import functools
+import logging
 import os
 import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, func,
+    inspect, select, text,
+)
+from sqlalchemy.schema import CreateTable
 
-# Add the parent directory to the path so we can import our app
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logger = logging.getLogger(__name__)
 
-from app import app, db
+@functools.lru_cache(maxsize=None)
+def _app():
+    """Import the Flask app and database on first use
+
+    Importing the app pulls in Flask, the models and every extension, so
+    it's deferred until a command actually talks to the database.
+    """
+    # Add the parent directory to the path so we can import our app
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app import app, db
+    return app, db
+
+# Advisory lock identifiers used while migrations run
+MIGRATION_LOCK_KEY = 0x4E474F  # "NGO"
+MIGRATION_LOCK_NAME = 'ngo_migrations'
+
+# Warn when a multi-database run has waited this long without progress
+MIGRATION_STUCK_SECONDS = 60
+
+# The bookkeeping table. It has its own MetaData so that create_all/drop_all
+# and reset never touch the migration history, and it's created through Core
+# so the DDL suits whichever database the app runs on.
+migrations_table = Table(
+    'migrations', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('version', Integer, nullable=False),
+    Column('name', String(100), nullable=False),
+    Column('description', Text),
+    Column('applied_at', DateTime, server_default=func.current_timestamp()),
+    sqlite_autoincrement=True,
+)
 
 class DatabaseMigration:
-    def __init__(self):
+    # Built by the first instance and shared by the rest
+    _MIGRATIONS = None
+    
+    def __init__(self, lock_key=MIGRATION_LOCK_KEY, lock_name=MIGRATION_LOCK_NAME):
         self.migrations = []
+        self._applied = None
+        self._cached_current_version = None
+        self._lock_key = lock_key
+        self._lock_name = lock_name
+        self._record_stmt = migrations_table.insert()
+        self._select_version = select(func.max(migrations_table.c.version))
+        # IF NOT EXISTS rather than checkfirst, which would probe the catalog
+        # before every version read
+        self._create_table_stmt = CreateTable(migrations_table, if_not_exists=True)
         self._register_migrations()
     
     def _register_migrations(self):
         """Register all available migrations"""
+        if DatabaseMigration._MIGRATIONS is not None:
+            self.migrations = DatabaseMigration._MIGRATIONS
+            self._index_migrations()
+            return
+        
         self.migrations = [
             {
                 'version': 1,
@@ -35,182 +90,589 @@ class DatabaseMigration:
                 'version': 2,
                 'name': 'Add Indexes',
                 'description': 'Add performance indexes to frequently queried columns',
-                'sql': '''
-                CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-                CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
-                CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
-                CREATE INDEX IF NOT EXISTS idx_events_start_date ON events(start_date);
-                CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
-                CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status);
-                CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(created_at);
-                '''
+                'indexes': [
+                    ('idx_users_email', 'users', ('email',)),
+                    ('idx_users_role', 'users', ('role',)),
+                    ('idx_users_created_at', 'users', ('created_at',)),
+                    ('idx_events_start_date', 'events', ('start_date',)),
+                    ('idx_events_category', 'events', ('category',)),
+                    ('idx_bookings_status', 'bookings', ('status',)),
+                    ('idx_messages_created_at', 'messages', ('created_at',)),
+                ]
             },
             {
                 'version': 3,
                 'name': 'Add Status to Events',
                 'description': 'Add status column to events table',
-                'sql': '''
-                ALTER TABLE events ADD COLUMN status VARCHAR(20) DEFAULT 'active';
-                CREATE INDEX IF NOT EXISTS idx_events_status ON events(status);
-                '''
+                'columns': [
+                    ('events', 'status', 'VARCHAR(20)', "'active'"),
+                ],
+                'indexes': [
+                    ('idx_events_status', 'events', ('status',)),
+                ]
             },
             {
                 'version': 4,
                 'name': 'Add Verification Fields',
                 'description': 'Add verification and active status fields',
+                'columns': [
+                    ('users', 'is_verified', 'BOOLEAN', 'FALSE'),
+                    ('users', 'is_active', 'BOOLEAN', 'TRUE'),
+                    ('ngos', 'is_verified', 'BOOLEAN', 'FALSE'),
+                ],
+                'indexes': [
+                    ('idx_users_verified', 'users', ('is_verified',)),
+                    ('idx_users_active', 'users', ('is_active',)),
+                    ('idx_ngos_verified', 'ngos', ('is_verified',)),
+                ]
+            },
+            {
+                'version': 5,
+                'name': 'Add Dashboard Indexes',
+                'description': 'Add composite indexes for dashboard queries and make profile user_id unique',
+                'indexes': [
+                    ('idx_events_ngo_created', 'events', ('ngo_id', 'created_at')),
+                    ('idx_bookings_volunteer_status', 'bookings', ('volunteer_id', 'status')),
+                    ('ix_ngos_user_id', 'ngos', ('user_id',), True),
+                    ('ix_volunteers_user_id', 'volunteers', ('user_id',), True),
+                    ('ix_donors_user_id', 'donors', ('user_id',), True),
+                ]
+            },
+            {
+                'version': 6,
+                'name': 'Denormalize Event Organization Name',
+                'description': 'Copy the owning NGO name onto events',
+                'columns': [
+                    ('events', 'organization_name', 'VARCHAR(100)', 'NULL'),
+                ],
                 'sql': '''
-                ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT FALSE;
-                ALTER TABLE users ADD COLUMN is_active BOOLEAN DEFAULT TRUE;
-                ALTER TABLE ngos ADD COLUMN is_verified BOOLEAN DEFAULT FALSE;
-                CREATE INDEX IF NOT EXISTS idx_users_verified ON users(is_verified);
-                CREATE INDEX IF NOT EXISTS idx_users_active ON users(is_active);
-                CREATE INDEX IF NOT EXISTS idx_ngos_verified ON ngos(is_verified);
+                UPDATE events SET organization_name = (
+                    SELECT organization_name FROM ngos WHERE ngos.id = events.ngo_id
+                );
+                ''',
+                # MySQL backfills with a join instead of a per-row subquery
+                'sql_mysql': '''
+                UPDATE events e JOIN ngos n ON n.id = e.ngo_id
+                SET e.organization_name = n.organization_name;
+                '''
+            },
+            {
+                'version': 7,
+                'name': 'Cascade Event Deletes',
+                'description': 'Delete time slots and bookings with their event via ON DELETE CASCADE',
+                'foreign_keys': [
+                    ('time_slots', 'event_id', 'events'),
+                    ('bookings', 'time_slot_id', 'time_slots'),
+                    ('bookings', 'event_id', 'events'),
+                ],
+                # SQLite can't alter a constraint, so it rebuilds both tables
+                'sql_sqlite': '''
+                CREATE TABLE time_slots_new (
+                    id INTEGER NOT NULL,
+                    event_id INTEGER NOT NULL,
+                    start_time DATETIME NOT NULL,
+                    end_time DATETIME NOT NULL,
+                    max_volunteers INTEGER,
+                    current_volunteers INTEGER,
+                    is_available BOOLEAN,
+                    created_at DATETIME,
+                    PRIMARY KEY (id),
+                    FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE
+                );
+                INSERT INTO time_slots_new (id, event_id, start_time, end_time, max_volunteers,
+                                            current_volunteers, is_available, created_at)
+                SELECT id, event_id, start_time, end_time, max_volunteers,
+                       current_volunteers, is_available, created_at
+                FROM time_slots;
+                DROP TABLE time_slots;
+                ALTER TABLE time_slots_new RENAME TO time_slots;
+                CREATE INDEX ix_time_slots_event_id ON time_slots (event_id);
+                CREATE INDEX ix_time_slots_start_time ON time_slots (start_time);
+                CREATE INDEX ix_time_slots_end_time ON time_slots (end_time);
+                CREATE INDEX ix_time_slots_is_available ON time_slots (is_available);
+                
+                CREATE TABLE bookings_new (
+                    id INTEGER NOT NULL,
+                    volunteer_id INTEGER NOT NULL,
+                    time_slot_id INTEGER NOT NULL,
+                    event_id INTEGER NOT NULL,
+                    status VARCHAR(20),
+                    hours_worked FLOAT,
+                    points_earned INTEGER,
+                    created_at DATETIME,
+                    PRIMARY KEY (id),
+                    FOREIGN KEY(volunteer_id) REFERENCES volunteers (id),
+                    FOREIGN KEY(time_slot_id) REFERENCES time_slots (id) ON DELETE CASCADE,
+                    FOREIGN KEY(event_id) REFERENCES events (id) ON DELETE CASCADE
+                );
+                INSERT INTO bookings_new (id, volunteer_id, time_slot_id, event_id, status,
+                                          hours_worked, points_earned, created_at)
+                SELECT id, volunteer_id, time_slot_id, event_id, status,
+                       hours_worked, points_earned, created_at
+                FROM bookings;
+                DROP TABLE bookings;
+                ALTER TABLE bookings_new RENAME TO bookings;
+                CREATE INDEX ix_bookings_volunteer_id ON bookings (volunteer_id);
+                CREATE INDEX ix_bookings_time_slot_id ON bookings (time_slot_id);
+                CREATE INDEX ix_bookings_event_id ON bookings (event_id);
+                CREATE INDEX ix_bookings_status ON bookings (status);
+                CREATE INDEX ix_bookings_created_at ON bookings (created_at);
+                CREATE INDEX idx_bookings_volunteer_status ON bookings (volunteer_id, status);
+                CREATE INDEX idx_bookings_status ON bookings (status);
                 '''
             }
         ]
+        DatabaseMigration._MIGRATIONS = self.migrations = tuple(self.migrations)
+        self._index_migrations()
+    
+    def _index_migrations(self):
+        """Build the version lookups used by the runner and status report"""
+        self._by_version = {m['version']: m for m in self.migrations}
+        self._latest_version = max(self._by_version)
+    
+    def invalidate(self):
+        """Forget the cached database state so the next call re-reads it"""
+        self._applied = None
+        self._cached_current_version = None
+    
+    def _create_table(self):
+        """Create the migrations table if the database doesn't have one yet"""
+        _, db = _app()
+        db.session.execute(self._create_table_stmt)
     
     def get_current_version(self):
         """Get the current database version"""
+        app, db = _app()
+        if self._cached_current_version is not None:
+            return self._cached_current_version
+        
         try:
             with app.app_context():
-                # Check if migration table exists
-                result = db.session.execute(text("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='migrations'
-                """))
-                
-                if not result.fetchone():
-                    # Create migrations table
-                    db.session.execute(text("""
-                        CREATE TABLE migrations (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            version INTEGER NOT NULL,
-                            name VARCHAR(100) NOT NULL,
-                            description TEXT,
-                            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                        )
-                    """))
-                    db.session.commit()
-                    return 0
+                self._create_table()
                 
                 # Get the latest version
-                result = db.session.execute(text("""
-                    SELECT MAX(version) as current_version FROM migrations
-                """))
+                result = db.session.execute(self._select_version)
                 row = result.fetchone()
-                return row[0] if row[0] else 0
+                db.session.commit()
+                self._cached_current_version = row[0] if row[0] else 0
+                return self._cached_current_version
                 
         except Exception as e:
-            print(f"Error getting current version: {e}")
+            logger.error("Error getting current version: %s", e)
             return 0
     
+    def _load_applied_versions(self):
+        """Get the set of applied migration versions in one query"""
+        _, db = _app()
+        self._create_table()
+        result = db.session.execute(select(migrations_table.c.version))
+        return frozenset(row[0] for row in result)
+    
+    def _is_sqlite(self):
+        """Check whether the app is running against SQLite"""
+        _, db = _app()
+        return db.engine.dialect.name == 'sqlite'
+    
+    def _split_statements(self, sql):
+        """Split a migration script into statements, dropping comment-only lines"""
+        statements = []
+        for chunk in sql.split(';'):
+            lines = [line for line in chunk.splitlines()
+                     if line.strip() and not line.strip().startswith('--')]
+            if lines:
+                statements.append('\n'.join(lines))
+        return statements
+    
+    def _add_column_online(self, inspector, table, column, coldef, default):
+        """Get the SQL that adds a column without rewriting its table
+        
+        SQLite, PostgreSQL 11+ and MySQL 8 keep a constant DEFAULT in the
+        table definition, so ADD COLUMN leaves existing rows alone and only
+        holds its lock briefly. Columns that already exist (e.g. created by
+        create_all) are skipped.
+        """
+        if inspector.has_table(table):
+            if column in {c['name'] for c in inspector.get_columns(table)}:
+                return ''
+        return f"ALTER TABLE {table} ADD COLUMN {column} {coldef} DEFAULT {default};\n"
+    
+    def _create_index_online(self, inspector, dialect, name, table, columns, unique=False):
+        """Get the SQL that creates an index, or rebuilds it to change uniqueness
+        
+        Indexes that already exist as asked are skipped, in place of CREATE
+        INDEX IF NOT EXISTS, which MySQL doesn't have.
+        """
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        existing = {index['name']: index for index in inspector.get_indexes(table)}
+        if name not in existing:
+            return f"CREATE {kind} {name} ON {table} ({', '.join(columns)});\n"
+        if bool(existing[name]['unique']) == unique:
+            return ''
+        if dialect == 'mysql':
+            # One ALTER, so a foreign key on the column always has an index
+            return f"ALTER TABLE {table} DROP INDEX {name}, ADD {kind} {name} ({', '.join(columns)});\n"
+        return f"DROP INDEX {name};\nCREATE {kind} {name} ON {table} ({', '.join(columns)});\n"
+    
+    def _cascade_foreign_key(self, inspector, dialect, table, column, referred_table):
+        """Get the SQL that makes a foreign key ON DELETE CASCADE in place"""
+        for fk in inspector.get_foreign_keys(table):
+            if fk['constrained_columns'] == [column] and fk['referred_table'] == referred_table:
+                break
+        else:
+            return ''
+        if (fk['options'].get('ondelete') or '').upper() == 'CASCADE':
+            return ''
+        drop = 'FOREIGN KEY' if dialect == 'mysql' else 'CONSTRAINT'
+        return (
+            f"ALTER TABLE {table} DROP {drop} {fk['name']};\n"
+            f"ALTER TABLE {table} ADD CONSTRAINT {fk['name']} FOREIGN KEY ({column}) "
+            f"REFERENCES {referred_table} (id) ON DELETE CASCADE;\n"
+        )
+    
+    def _migration_sql(self, migration):
+        """Get a migration's full script for the app's database
+        
+        Columns come first, then indexes and foreign keys, then the
+        migration's own SQL, or its sql_<dialect> variant if it has one.
+        """
+        _, db = _app()
+        dialect = db.engine.dialect.name
+        sql = migration.get(f'sql_{dialect}', migration.get('sql', ''))
+        columns = migration.get('columns', ())
+        indexes = migration.get('indexes', ())
+        # SQLite migrations rebuild tables to change their foreign keys
+        foreign_keys = migration.get('foreign_keys', ()) if dialect != 'sqlite' else ()
+        if not (columns or indexes or foreign_keys):
+            return sql
+        inspector = inspect(db.session.connection())
+        return ''.join(
+            [self._add_column_online(inspector, *column) for column in columns]
+            + [self._create_index_online(inspector, dialect, *index) for index in indexes]
+            + [self._cascade_foreign_key(inspector, dialect, *fk) for fk in foreign_keys]
+        ) + sql
+    
     def apply_migration(self, migration):
-        """Apply a single migration"""
+        """Run a single migration's SQL without committing"""
+        _, db = _app()
+        logger.info("Applying migration %d: %s", migration['version'], migration['name'])
         try:
-            with app.app_context():
-                print(f"Applying migration {migration['version']}: {migration['name']}")
-                
-                # Execute the migration SQL
-                if migration['sql'].strip():
-                    db.session.execute(text(migration['sql']))
-                
-                # Record the migration
-                db.session.execute(text("""
-                    INSERT INTO migrations (version, name, description)
-                    VALUES (:version, :name, :description)
-                """), {
-                    'version': migration['version'],
-                    'name': migration['name'],
-                    'description': migration['description']
-                })
-                
-                db.session.commit()
-                print(f"✅ Migration {migration['version']} applied successfully")
-                
+            for statement in self._split_statements(self._migration_sql(migration)):
+                db.session.execute(text(statement))
+            self.invalidate()
         except Exception as e:
-            db.session.rollback()
-            print(f"❌ Error applying migration {migration['version']}: {e}")
+            logger.error("❌ Error applying migration %d: %s", migration['version'], e)
             raise
     
+    def _apply_sqlite_script(self, migrations):
+        """Run several migrations on SQLite as one script in one transaction"""
+        _, db = _app()
+        # executescript commits any open transaction before it runs, so the
+        # BEGIN has to be part of the script itself. Foreign keys are switched
+        # off first (SQLite ignores the pragma inside a transaction) so that
+        # migrations can rebuild referenced tables.
+        for migration in migrations:
+            logger.info("Applying migration %d: %s", migration['version'], migration['name'])
+        script = '\n'.join(self._migration_sql(m) for m in migrations)
+        raw = db.session.connection().connection
+        raw.executescript('PRAGMA foreign_keys=OFF;\nBEGIN;\n' + script)
+    
+    def _acquire_lock(self):
+        """Take a database-wide lock so only one process runs migrations"""
+        _, db = _app()
+        dialect = db.engine.dialect.name
+        
+        if dialect == 'sqlite':
+            # Exclusive locking mode keeps the lock past the COMMIT that
+            # executescript issues before running the migration script
+            db.session.execute(text("PRAGMA locking_mode=EXCLUSIVE"))
+            db.session.execute(text("BEGIN EXCLUSIVE"))
+            return None
+        
+        # Advisory locks belong to the connection that took them, so hold
+        # them on a connection of their own
+        lock_conn = db.engine.connect()
+        if dialect == 'postgresql':
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {'key': self._lock_key})
+        elif dialect == 'mysql':
+            acquired = lock_conn.execute(text("SELECT GET_LOCK(:name, 30)"), {'name': self._lock_name}).scalar()
+            if acquired != 1:
+                lock_conn.close()
+                raise RuntimeError("Timed out waiting for the migration lock")
+        return lock_conn
+    
+    def _release_lock(self, lock_conn):
+        """Release the lock taken by _acquire_lock"""
+        _, db = _app()
+        if lock_conn is None:
+            # Back in normal locking mode SQLite drops the lock on the next
+            # read of the database file
+            db.session.execute(text("PRAGMA locking_mode=NORMAL"))
+            db.session.execute(text("SELECT COUNT(*) FROM sqlite_master"))
+            db.session.commit()
+            return
+        
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self._lock_key})
+        elif dialect == 'mysql':
+            lock_conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': self._lock_name})
+        lock_conn.close()
+    
     def run_migrations(self):
-        """Run all pending migrations"""
-        current_version = self.get_current_version()
-        print(f"Current database version: {current_version}")
+        """Run all pending migrations; returns False if they failed"""
+        app, _ = _app()
+        with app.app_context():
+            lock_conn = self._acquire_lock()
+            try:
+                return self._run_pending()
+            finally:
+                self._release_lock(lock_conn)
+                # Re-read on the next call
+                self.invalidate()
+    
+    def run_migrations_multi(self, targets, workers=6, batch=50):
+        """Run migrations against many databases or schemas in parallel
         
-        pending_migrations = [
-            m for m in self.migrations 
-            if m['version'] > current_version
-        ]
+        Each target is either a database URL or the name of a schema in the
+        app's own (PostgreSQL) database. Targets run in worker processes, so
+        every one gets its own engine, session and migration lock. Returns
+        False if any target failed.
+        """
+        targets = list(targets)
+        failed = []
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(targets), batch):
+                chunk = targets[start:start + batch]
+                batch_started = time.monotonic()
+                futures = {pool.submit(_migrate_target, target): target for target in chunk}
+                
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=MIGRATION_STUCK_SECONDS,
+                                         return_when=FIRST_COMPLETED)
+                    if not done:
+                        waiting = ', '.join(futures[f] for f in pending)
+                        logger.warning("⚠️  No progress for %ds, still waiting on: %s",
+                                       MIGRATION_STUCK_SECONDS, waiting)
+                    for future in done:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            failed.append(futures[future])
+                            logger.error("❌ Migrating %s failed: %s", futures[future], e)
+                
+                logger.info("Batch %d: %d targets in %.1fs", start // batch + 1,
+                            len(chunk), time.monotonic() - batch_started)
+        
+        if failed:
+            logger.error("Migration failed for %d of %d targets", len(failed), len(targets))
+            return False
+        logger.info("✅ Migrated %d targets", len(targets))
+        return True
+    
+    def _run_pending(self):
+        """Apply pending migrations; the caller holds the migration lock"""
+        _, db = _app()
+        self._applied = self._load_applied_versions()
+        logger.info("Current database version: %d", max(self._applied, default=0))
+        
+        # Anything not recorded is pending, including versions older than the
+        # newest applied one (e.g. a migration merged out of order)
+        pending_versions = sorted(set(self._by_version) - self._applied)
+        pending_migrations = [self._by_version[v] for v in pending_versions]
         
         if not pending_migrations:
-            print("✅ Database is up to date")
-            return
+            logger.info("✅ Database is up to date")
+            return True
         
-        print(f"Found {len(pending_migrations)} pending migrations")
+        logger.info("Found %d pending migrations", len(pending_migrations))
         
-        for migration in sorted(pending_migrations, key=lambda x: x['version']):
-            try:
-                self.apply_migration(migration)
-            except Exception as e:
-                print(f"Migration failed: {e}")
-                break
+        # Apply everything in one transaction and record all versions with a
+        # single executemany, so a failure leaves no migration half-recorded.
+        # MySQL commits each DDL statement on its own; a failed batch there is
+        # safe to re-run because existing columns and indexes are skipped.
+        try:
+            if self._is_sqlite():
+                self._apply_sqlite_script(pending_migrations)
+            else:
+                for migration in pending_migrations:
+                    self.apply_migration(migration)
+            
+            db.session.execute(self._record_stmt, [{
+                'version': m['version'],
+                'name': m['name'],
+                'description': m['description']
+            } for m in pending_migrations])
+            
+            db.session.commit()
+            logger.info("✅ Applied %d migrations successfully", len(pending_migrations))
+            return True
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Migration failed: %s", e)
+            return False
+        
+        finally:
+            if self._is_sqlite():
+                db.session.execute(text("PRAGMA foreign_keys=ON"))
     
     def show_migrations(self):
         """Show all migrations and their status"""
+        app, db = _app()
+        # Repeated status calls reuse the versions read the first time
+        if self._applied is None:
+            with app.app_context():
+                self._applied = self._load_applied_versions()
+                db.session.commit()
+            self._cached_current_version = max(self._applied, default=0)
+        applied = self._applied
         current_version = self.get_current_version()
         
+        # The report is the command's output, so it's printed even with --quiet
         print("Migration Status:")
         print("=" * 60)
         
         for migration in self.migrations:
-            status = "✅ Applied" if migration['version'] <= current_version else "⏳ Pending"
-            print(f"{migration['version']:2d} | {status:10s} | {migration['name']}")
+            status = "✅ Applied" if migration['version'] in applied else "⏳ Pending"
+            print("%2d | %-10s | %s" % (migration['version'], status, migration['name']))
         
-        print(f"\nCurrent version: {current_version}")
-        print(f"Latest available version: {max(m['version'] for m in self.migrations)}")
+        print("\nCurrent version: %d" % current_version)
+        print("Latest available version: %d" % self._latest_version)
     
-    def reset_database(self):
-        """Reset the database (DANGEROUS - removes all data)"""
-        confirm = input("⚠️  This will delete ALL data. Are you sure? (yes/no): ")
-        if confirm.lower() != 'yes':
-            print("Database reset cancelled")
-            return
+    def _fast_truncate(self):
+        """Empty every model table but keep the schema and migration history"""
+        _, db = _app()
+        # Children before parents so foreign keys never block a delete
+        tables = [table.name for table in reversed(db.metadata.sorted_tables)]
+        dialect = db.engine.dialect.name
+        
+        if dialect == 'sqlite':
+            raw = db.session.connection().connection
+            script = ''.join(f"DELETE FROM {table};\n" for table in tables)
+            # sqlite_sequence only exists once some table uses AUTOINCREMENT
+            if raw.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+                names = ', '.join(f"'{table}'" for table in tables)
+                script += f"DELETE FROM sqlite_sequence WHERE name IN ({names});\n"
+            raw.executescript(f"BEGIN;\n{script}COMMIT;")
+        elif dialect == 'postgresql':
+            db.session.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+        elif dialect == 'mysql':
+            db.session.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            for table in tables:
+                db.session.execute(text(f"TRUNCATE TABLE {table}"))
+            db.session.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        else:
+            for table in tables:
+                db.session.execute(text(f"DELETE FROM {table}"))
+        db.session.commit()
+    
+    def reset_database(self, hard=False):
+        """Reset the database (DANGEROUS - removes all data)
+        
+        By default every table is emptied in place. With hard=True the
+        tables are dropped and recreated instead. Returns False if the
+        reset was refused, cancelled or failed.
+        """
+        app, db = _app()
+        if os.environ.get('NGO_MIGRATION_FORCE') != '1':
+            if not sys.stdin.isatty():
+                logger.error("Refusing to reset without confirmation; set NGO_MIGRATION_FORCE=1")
+                return False
+            confirm = input("⚠️  This will delete ALL data. Are you sure? (yes/no): ")
+            if confirm.lower() != 'yes':
+                logger.info("Database reset cancelled")
+                return False
         
         try:
             with app.app_context():
-                # Drop all tables
-                db.drop_all()
-                
-                # Recreate tables
-                db.create_all()
-                
-                # Reset migration table
-                db.session.execute(text("DELETE FROM migrations"))
-                db.session.commit()
+                if hard:
+                    # Drop all tables
+                    db.drop_all()
+                    
+                    # Recreate tables
+                    db.create_all()
+                    
+                    # Reset migration table
+                    self._create_table()
+                    db.session.execute(migrations_table.delete())
+                    db.session.commit()
+                else:
+                    self._fast_truncate()
+                self.invalidate()
                 
-                print("✅ Database reset successfully")
+                logger.info("✅ Database reset successfully")
+                return True
                 
         except Exception as e:
-            print(f"❌ Error resetting database: {e}")
+            logger.error("❌ Error resetting database: %s", e)
+            return False
+
+def _migrate_target(target):
+    """Run migrations for one database URL or schema inside a worker process"""
+    app, db = _app()
+    if '://' in target:
+        engine = create_engine(target)
+    else:
+        engine = create_engine(
+            app.config['SQLALCHEMY_DATABASE_URI'],
+            connect_args={'options': f'-csearch_path={target}'}
+        )
+    
+    # Point this process's default engine at the target; the engine map is
+    # shared by every app context, so run_migrations picks it up. The engine
+    # it replaces (the app's own, or the previous target's) is disposed.
+    with app.app_context():
+        db.engines[None].dispose()
+        db.engines[None] = engine
+    
+    try:
+        # Key the lock on the target so different databases migrate in parallel
+        migration_system = DatabaseMigration(
+            lock_key=zlib.crc32(target.encode()),
+            lock_name=f"{MIGRATION_LOCK_NAME}:{zlib.crc32(target.encode()):08x}"
+        )
+        if not migration_system.run_migrations():
+            raise RuntimeError("pending migrations were rolled back")
+    finally:
+        engine.dispose()
 
 def main():
     """Main function for running migrations"""
+    args = [arg for arg in sys.argv[1:] if arg != '--quiet']
+    
+    # --quiet keeps only warnings and errors, e.g. for CI logs
+    logging.basicConfig(
+        level=logging.WARNING if '--quiet' in sys.argv[1:] else logging.INFO,
+        format='%(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    
     migration_system = DatabaseMigration()
+    succeeded = True
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    if args:
+        command = args[0]
         
         if command == 'status':
             migration_system.show_migrations()
         elif command == 'migrate':
-            migration_system.run_migrations()
+            succeeded = migration_system.run_migrations()
+        elif command == 'migrate-all':
+            succeeded = migration_system.run_migrations_multi(args[1:])
         elif command == 'reset':
-            migration_system.reset_database()
+            succeeded = migration_system.reset_database(hard='--hard' in args[1:])
         else:
-            print("Unknown command. Use: status, migrate, or reset")
+            logger.error("Unknown command. Use: status, migrate, migrate-all <targets...>, or reset [--hard] (add --quiet to hide progress)")
+            succeeded = False
     else:
         # Default: run migrations
-        migration_system.run_migrations()
+        succeeded = migration_system.run_migrations()
+    
+    # A non-zero exit status lets CI and deploy scripts stop on failure
+    if not succeeded:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
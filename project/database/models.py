@@ -1,10 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
 from datetime import datetime
 import json
+import sqlite3
 
 db = SQLAlchemy()
 
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Turn on foreign key enforcement so ON DELETE CASCADE works on SQLite"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Database Models
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -33,7 +44,7 @@ class NGO(db.Model):
     __tablename__ = 'ngos'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
     organization_name = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text)
     mission = db.Column(db.Text)
@@ -59,10 +70,10 @@ class Volunteer(db.Model):
     __tablename__ = 'volunteers'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
     bio = db.Column(db.Text)
-    skills = db.Column(db.Text)  # JSON string of skills
-    interests = db.Column(db.Text)  # JSON string of interests
+    skills = db.Column(db.JSON)  # list of skills
+    interests = db.Column(db.JSON)  # list of interests
     availability = db.Column(db.Text)  # JSON string of availability
     total_hours = db.Column(db.Integer, default=0, index=True)
     total_points = db.Column(db.Integer, default=0, index=True)
@@ -73,15 +84,11 @@ class Volunteer(db.Model):
     
     def get_skills_list(self):
         """Get skills as a list"""
-        if self.skills:
-            return json.loads(self.skills)
-        return []
+        return self.skills or []
     
     def get_interests_list(self):
         """Get interests as a list"""
-        if self.interests:
-            return json.loads(self.interests)
-        return []
+        return self.interests or []
     
     def get_availability_dict(self):
         """Get availability as a dictionary"""
@@ -93,7 +100,7 @@ class Donor(db.Model):
     __tablename__ = 'donors'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
     company_name = db.Column(db.String(100))
     donation_history = db.Column(db.Text)  # JSON string
     preferences = db.Column(db.Text)  # JSON string
@@ -113,16 +120,21 @@ class Donor(db.Model):
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # NGO dashboards list an NGO's events newest first
+        db.Index('idx_events_ngo_created', 'ngo_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     ngo_id = db.Column(db.Integer, db.ForeignKey('ngos.id'), nullable=False, index=True)
+    organization_name = db.Column(db.String(100))  # copy of NGO.organization_name
     title = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text)
     location = db.Column(db.String(200))
     start_date = db.Column(db.DateTime, nullable=False, index=True)
     end_date = db.Column(db.DateTime, nullable=False, index=True)
     max_volunteers = db.Column(db.Integer)
-    required_skills = db.Column(db.Text)  # JSON string
+    required_skills = db.Column(db.JSON)  # list of skills
     category = db.Column(db.String(50), index=True)
     image = db.Column(db.String(200))
     status = db.Column(db.String(20), default='active', index=True)  # active, completed, cancelled
@@ -131,20 +143,29 @@ class Event(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    time_slots = db.relationship('TimeSlot', backref='event', lazy='dynamic', cascade='all, delete-orphan')
-    bookings = db.relationship('Booking', backref='event', lazy='dynamic', cascade='all, delete-orphan')
+    time_slots = db.relationship('TimeSlot', backref='event', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    bookings = db.relationship('Booking', backref='event', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     
     def get_required_skills(self):
         """Get required skills as a list"""
-        if self.required_skills:
-            return json.loads(self.required_skills)
-        return []
+        return self.required_skills or []
+
+@event.listens_for(NGO, 'after_update')
+def propagate_organization_name(mapper, connection, target):
+    """Keep Event.organization_name in sync when an NGO is renamed"""
+    if not inspect(target).attrs.organization_name.history.has_changes():
+        return
+    connection.execute(
+        Event.__table__.update()
+        .where(Event.__table__.c.ngo_id == target.id)
+        .values(organization_name=target.organization_name)
+    )
 
 class TimeSlot(db.Model):
     __tablename__ = 'time_slots'
     
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), nullable=False, index=True)
     start_time = db.Column(db.DateTime, nullable=False, index=True)
     end_time = db.Column(db.DateTime, nullable=False, index=True)
     max_volunteers = db.Column(db.Integer, default=1)
@@ -153,15 +174,19 @@ class TimeSlot(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    bookings = db.relationship('Booking', backref='time_slot', lazy='dynamic', cascade='all, delete-orphan')
+    bookings = db.relationship('Booking', backref='time_slot', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Volunteer dashboards filter a volunteer's bookings by status
+        db.Index('idx_bookings_volunteer_status', 'volunteer_id', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteers.id'), nullable=False, index=True)
-    time_slot_id = db.Column(db.Integer, db.ForeignKey('time_slots.id'), nullable=False, index=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    time_slot_id = db.Column(db.Integer, db.ForeignKey('time_slots.id', ondelete='CASCADE'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), nullable=False, index=True)
     status = db.Column(db.String(20), default='confirmed', index=True)  # confirmed, completed, cancelled
     hours_worked = db.Column(db.Float, default=0)
     points_earned = db.Column(db.Integer, default=0)
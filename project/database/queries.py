@@ -4,7 +4,7 @@ Database Queries Module
 Common database operations and optimized queries
 """
 
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, case
 from datetime import datetime, timedelta
 import json
 
@@ -148,23 +148,26 @@ class DatabaseQueries:
         return query.all()
     
     def get_volunteer_stats(self, volunteer_id):
-        """Get volunteer statistics"""
-        bookings = self.models.Booking.query.filter_by(volunteer_id=volunteer_id)
-        
-        total_bookings = bookings.count()
-        completed_bookings = bookings.filter_by(status='completed').count()
-        total_hours = bookings.with_entities(
-            func.sum(self.models.Booking.hours_worked)
-        ).scalar() or 0
-        total_points = bookings.with_entities(
-            func.sum(self.models.Booking.points_earned)
-        ).scalar() or 0
+        """Get volunteer statistics in a single aggregate query"""
+        Booking = self.models.Booking
+        total_bookings, completed_bookings, total_hours, total_points = (
+            self.db.session.query(
+                func.count(Booking.id),
+                func.sum(case((Booking.status == 'completed', 1), else_=0)),
+                func.sum(Booking.hours_worked),
+                func.sum(Booking.points_earned)
+            )
+            .filter(Booking.volunteer_id == volunteer_id)
+            .one()
+        )
+        completed_bookings = completed_bookings or 0
         
         return {
             'total_bookings': total_bookings,
             'completed_bookings': completed_bookings,
-            'total_hours': total_hours,
-            'total_points': total_points
+            'completed_events': completed_bookings,
+            'total_hours': total_hours or 0,
+            'total_points': total_points or 0
         }
     
     # Message Queries
@@ -331,10 +334,23 @@ class DatabaseQueries:
         volunteer_skills = volunteer.get_skills_list()
         volunteer_interests = volunteer.get_interests_list()
         
+        Event = self.models.Event
+        query = Event.query.filter_by(status='active')
+        
+        # On MySQL the JSON column lets the server drop events with no
+        # overlapping skill or interest before they reach Python
+        if self.db.engine.dialect.name == 'mysql':
+            query = query.filter(
+                or_(
+                    func.json_overlaps(Event.required_skills, json.dumps(volunteer_skills)),
+                    Event.category.in_(volunteer_interests)
+                )
+            )
+        
         # Find events that match volunteer's skills or interests
         matching_events = []
         
-        for event in self.models.Event.query.filter_by(status='active').all():
+        for event in query.all():
             event_skills = event.get_required_skills()
             
             # Check for skill matches
@@ -5,7 +5,6 @@ Run: python -m database.seed
 """
 
 from datetime import datetime, timedelta, time
-import json
 import random
 
 from .models import db, User, NGO, Volunteer, Donor, Event, TimeSlot, Booking
@@ -87,8 +86,8 @@ def create_sample_data():
             vol = Volunteer(
                 user_id=user.id,
                 bio=f"Volunteer {first_name} {last_name}",
-                skills=json.dumps(skills),
-                interests=json.dumps(interests),
+                skills=skills,
+                interests=interests,
                 total_hours=0,
                 total_points=0,
                 created_at=datetime.utcnow(),
@@ -107,13 +106,14 @@ def create_sample_data():
             end_dt = datetime.combine(start_day, time(hour=17))
             event = Event(
                 ngo_id=ngo.id,
+                organization_name=ngo.organization_name,
                 title=f"{ngo.organization_name} Event {i+1}",
                 description=f"Help {ngo.organization_name} with a day of service.",
                 location=f"{ngo.city} Center",
                 start_date=start_dt,
                 end_date=start_dt,
                 max_volunteers=5,
-                required_skills=json.dumps(["Coordination", "Teamwork"]),
+                required_skills=["Coordination", "Teamwork"],
                 category=random.choice(categories),
                 status='active',
                 is_active=True,
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Gunicorn Configuration
+Production server settings for the NGO Connect platform
+
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Eventlet workers serve both HTTP and the Socket.IO WebSocket transport.
+# Each worker keeps its own Socket.IO rooms and chat buffers, so running more
+# than one requires sticky sessions at the load balancer.
+worker_class = 'eventlet'
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+worker_connections = 1000
+
+# Keep client connections open between the burst of AJAX calls a dashboard
+# makes, instead of paying a new TCP/TLS handshake for each one
+keepalive = 30
+timeout = 60
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Compile all templates once the worker has loaded the app"""
+    from app import warm_template_cache
+    warm_template_cache()
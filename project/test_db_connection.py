@@ -1,7 +1,7 @@
-import mysql.connector
+import MySQLdb
 
 try:
-    conn = mysql.connector.connect(
+    conn = MySQLdb.connect(
         host='127.0.0.1',
         port=3306,
         user="root",
@@ -10,5 +10,5 @@ try:
     )
     print("✅ Connected to external database!")
     conn.close()
-except mysql.connector.Error as err:
+except MySQLdb.Error as err:
     print("❌ Error:", err)
@@ -2,18 +2,21 @@
 """
 Test script for NGO Event CRUD operations
 """
+import logging
 import os
 import sys
-import json
 from datetime import datetime, timedelta
+from sqlalchemy import func
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import app, db
-from database.models import User, NGO, Event, TimeSlot, Booking
+from database.models import User, NGO, Volunteer, Event, TimeSlot, Booking
 from werkzeug.security import generate_password_hash
 
+logger = logging.getLogger(__name__)
+
 def test_ngo_event_crud():
     """Test the NGO event CRUD operations"""
     
@@ -21,11 +24,11 @@ def test_ngo_event_crud():
         # Create database tables
         db.create_all()
         
-        print("Testing NGO Event CRUD Operations...")
-        print("=" * 50)
+        logger.info("Testing NGO Event CRUD Operations...")
+        logger.info("=" * 50)
         
         # 1. Create a test NGO user
-        print("1. Creating test NGO user...")
+        logger.info("1. Creating test NGO user...")
         ngo_user = User(
             email='test_ngo@example.com',
             password_hash=generate_password_hash('password123'),
@@ -34,8 +37,10 @@ def test_ngo_event_crud():
             last_name='NGO',
             phone='1234567890'
         )
+        # Each tier is flushed to get its primary key, and everything is
+        # committed once after the time slots
         db.session.add(ngo_user)
-        db.session.commit()
+        db.session.flush()
         
         ngo = NGO(
             user_id=ngo_user.id,
@@ -50,12 +55,12 @@ def test_ngo_event_crud():
             category='Community Service'
         )
         db.session.add(ngo)
-        db.session.commit()
+        db.session.flush()
         
-        print(f"   ✓ Created NGO: {ngo.organization_name}")
+        logger.info("   ✓ Created NGO: %s", ngo.organization_name)
         
         # 2. Create a test event
-        print("\n2. Creating test event...")
+        logger.info("\n2. Creating test event...")
         event = Event(
             ngo_id=ngo.id,
             title='Test Community Cleanup',
@@ -65,100 +70,218 @@ def test_ngo_event_crud():
             end_date=datetime.now() + timedelta(days=7),
             category='Community Service',
             max_volunteers=10,
-            required_skills=json.dumps(['Manual Labor', 'Organization']),
+            required_skills=['Manual Labor', 'Organization'],
             is_active=True
         )
         db.session.add(event)
-        db.session.commit()
+        db.session.flush()
         
-        print(f"   ✓ Created event: {event.title}")
-        print(f"   ✓ Event ID: {event.id}")
-        print(f"   ✓ Required skills: {event.get_required_skills()}")
+        logger.info("   ✓ Created event: %s", event.title)
+        logger.info("   ✓ Event ID: %s", event.id)
+        logger.info("   ✓ Required skills: %s", event.get_required_skills())
         
         # 3. Create time slots for the event
-        print("\n3. Creating time slots...")
-        start_date = event.start_date
+        logger.info("\n3. Creating time slots...")
+        day_start = datetime.combine(event.start_date.date(), datetime.min.time())
+        two_hours = timedelta(hours=2)
+        slots = []
         for hour in range(9, 17, 2):
-            start_time = datetime.combine(start_date, datetime.min.time().replace(hour=hour))
-            end_time = start_time + timedelta(hours=2)
+            start_time = day_start.replace(hour=hour)
+            end_time = start_time + two_hours
             
-            time_slot = TimeSlot(
+            slots.append(TimeSlot(
                 event_id=event.id,
                 start_time=start_time,
                 end_time=end_time,
                 max_volunteers=event.max_volunteers,
                 current_volunteers=0,
                 is_available=True
-            )
-            db.session.add(time_slot)
+            ))
         
+        # Insert all slots in one executemany batch
+        db.session.bulk_save_objects(slots)
         db.session.commit()
-        print(f"   ✓ Created {len(event.time_slots.all())} time slots")
+        logger.info("   ✓ Created %s time slots", len(slots))
         
         # 4. Test reading events
-        print("\n4. Testing event retrieval...")
+        logger.info("\n4. Testing event retrieval...")
         events = Event.query.filter_by(ngo_id=ngo.id).all()
-        print(f"   ✓ Found {len(events)} events for NGO")
+        logger.info("   ✓ Found %s events for NGO", len(events))
         
-        for evt in events:
-            print(f"   - {evt.title} (Active: {evt.is_active})")
-            print(f"     Skills: {evt.get_required_skills()}")
-            print(f"     Time slots: {evt.time_slots.count()}")
+        # Per-event details only when running with --verbose
+        if logger.isEnabledFor(logging.DEBUG):
+            # time_slots is a dynamic relationship, so count every event's
+            # slots in one grouped query instead of one COUNT per event
+            slot_counts = dict(
+                db.session.query(TimeSlot.event_id, func.count(TimeSlot.id))
+                .filter(TimeSlot.event_id.in_([evt.id for evt in events]))
+                .group_by(TimeSlot.event_id)
+                .all()
+            )
+            for evt in events:
+                logger.debug("   - %s (Active: %s)", evt.title, evt.is_active)
+                logger.debug("     Skills: %s", evt.get_required_skills())
+                logger.debug("     Time slots: %s", slot_counts.get(evt.id, 0))
         
         # 5. Test updating event
-        print("\n5. Testing event update...")
+        logger.info("\n5. Testing event update...")
         event.title = 'Updated Community Cleanup Event'
         event.description = 'Updated description for the test event'
         event.updated_at = datetime.utcnow()
         db.session.commit()
         
         updated_event = Event.query.get(event.id)
-        print(f"   ✓ Updated event title: {updated_event.title}")
-        print(f"   ✓ Updated at: {updated_event.updated_at}")
+        logger.info("   ✓ Updated event title: %s", updated_event.title)
+        logger.info("   ✓ Updated at: %s", updated_event.updated_at)
         
         # 6. Test event status toggle
-        print("\n6. Testing event status toggle...")
+        logger.info("\n6. Testing event status toggle...")
         original_status = event.is_active
         event.is_active = not event.is_active
         db.session.commit()
         
         toggled_event = Event.query.get(event.id)
-        print(f"   ✓ Toggled status from {original_status} to {toggled_event.is_active}")
+        logger.info("   ✓ Toggled status from %s to %s", original_status, toggled_event.is_active)
         
         # 7. Test event deletion
-        print("\n7. Testing event deletion...")
+        logger.info("\n7. Testing event deletion...")
         event_id = event.id
         time_slot_count = event.time_slots.count()
         
-        # Delete related bookings and time slots first
-        Booking.query.filter_by(event_id=event.id).delete()
-        TimeSlot.query.filter_by(event_id=event.id).delete()
+        # Book a slot so the delete has bookings to cascade to as well
+        volunteer_user = User(
+            email='test_volunteer@example.com',
+            password_hash=generate_password_hash('password123'),
+            role='volunteer',
+            first_name='Test',
+            last_name='Volunteer'
+        )
+        db.session.add(volunteer_user)
+        db.session.flush()
+        volunteer = Volunteer(user_id=volunteer_user.id)
+        db.session.add(volunteer)
+        db.session.flush()
+        db.session.add(Booking(
+            volunteer_id=volunteer.id,
+            time_slot_id=event.time_slots.first().id,
+            event_id=event_id
+        ))
+        db.session.commit()
         
-        # Delete the event
+        # Time slots and bookings go with the event via ON DELETE CASCADE
         db.session.delete(event)
         db.session.commit()
         
         # Verify deletion
-        deleted_event = Event.query.get(event_id)
-        if deleted_event is None:
-            print(f"   ✓ Successfully deleted event {event_id}")
-            print(f"   ✓ Deleted {time_slot_count} associated time slots")
-        else:
-            print(f"   ✗ Failed to delete event {event_id}")
+        assert Event.query.get(event_id) is None
+        assert TimeSlot.query.filter_by(event_id=event_id).count() == 0
+        assert Booking.query.filter_by(event_id=event_id).count() == 0
+        logger.info("   ✓ Successfully deleted event %s", event_id)
+        logger.info("   ✓ Deleted %s associated time slots and their bookings", time_slot_count)
         
         # 8. Clean up test data
-        print("\n8. Cleaning up test data...")
+        logger.info("\n8. Cleaning up test data...")
         db.session.delete(ngo)
         db.session.delete(ngo_user)
+        db.session.delete(volunteer_user)
         db.session.commit()
-        print("   ✓ Cleaned up test data")
+        logger.info("   ✓ Cleaned up test data")
         
-        print("\n" + "=" * 50)
-        print("All NGO Event CRUD tests completed successfully!")
-        print("The event management system is working correctly.")
+        logger.info("\n" + "=" * 50)
+        logger.info("All NGO Event CRUD tests completed successfully!")
+        logger.info("The event management system is working correctly.")
+
+def test_book_slot_fills_to_capacity():
+    """Every seat of a multi-volunteer slot can be booked, and no more"""
+    
+    with app.app_context():
+        db.create_all()
+        
+        ngo_user = User(
+            email='test_booking_ngo@example.com',
+            password_hash=generate_password_hash('password123'),
+            role='ngo',
+            first_name='Test',
+            last_name='NGO'
+        )
+        volunteer_users = [User(
+            email=f'test_booking_volunteer{i}@example.com',
+            password_hash=generate_password_hash('password123'),
+            role='volunteer',
+            first_name='Test',
+            last_name=f'Volunteer{i}'
+        ) for i in range(4)]
+        db.session.add_all([ngo_user] + volunteer_users)
+        db.session.flush()
+        
+        ngo = NGO(user_id=ngo_user.id, organization_name='Test Booking NGO')
+        volunteers = [Volunteer(user_id=user.id) for user in volunteer_users]
+        db.session.add_all([ngo] + volunteers)
+        db.session.flush()
+        
+        event = Event(
+            ngo_id=ngo.id,
+            organization_name=ngo.organization_name,
+            title='Test Booking Event',
+            start_date=datetime.now() + timedelta(days=7),
+            end_date=datetime.now() + timedelta(days=7),
+            max_volunteers=3
+        )
+        db.session.add(event)
+        db.session.flush()
+        
+        slot = TimeSlot(
+            event_id=event.id,
+            start_time=event.start_date,
+            end_time=event.start_date + timedelta(hours=2),
+            max_volunteers=3,
+            current_volunteers=0,
+            is_available=True
+        )
+        db.session.add(slot)
+        db.session.commit()
+        slot_id, event_id = slot.id, event.id
+        user_ids = [ngo_user.id] + [user.id for user in volunteer_users]
+    
+    csrf_enabled = app.config['WTF_CSRF_ENABLED']
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        statuses = []
+        for user_id in user_ids[1:]:
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+            response = client.post('/api/book-slot', json={'slot_id': slot_id, 'event_id': event_id})
+            statuses.append(response.status_code)
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+    
+    with app.app_context():
+        slot = db.session.get(TimeSlot, slot_id)
+        logger.info("Booking statuses: %s", statuses)
+        
+        # The last seat is bookable, and the slot closes once it's taken
+        assert statuses == [200, 200, 200, 400]
+        assert slot.current_volunteers == 3
+        assert slot.is_available is False
+        assert Booking.query.filter_by(time_slot_id=slot_id).count() == 3
+        
+        # Deleting the users cascades to their profiles, the event, the
+        # slot and the bookings
+        for user_id in user_ids:
+            db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        assert db.session.get(TimeSlot, slot_id) is None
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.DEBUG if '--verbose' in sys.argv[1:] else logging.INFO,
+        format='%(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
     test_ngo_event_crud()
+    test_book_slot_fills_to_capacity()
 
 
 
@@ -0,0 +1,84 @@
+"""
+io_uring File Writer
+Write-only file object that submits writes through an io_uring ring
+"""
+
+import os
+from liburing import (
+    Ring, Cqe, io_uring_queue_init, io_uring_queue_exit, io_uring_get_sqe,
+    io_uring_prep_write, io_uring_submit, io_uring_wait_cqe, io_uring_cq_ready,
+    io_uring_cq_advance
+)
+
+class UringFile:
+    """Sequential file writer backed by io_uring.
+
+    Each write() becomes one write SQE at the next file offset. SQEs are
+    submitted together once `entries` are queued (or on flush/close), so
+    a large upload costs one io_uring_enter per batch instead of one
+    write syscall per chunk.
+    """
+
+    def __init__(self, path, entries=8):
+        self.entries = entries
+        self.offset = 0
+        self._pending = []  # buffers must stay alive until their CQE is reaped
+        self._ring = Ring()
+        self._cqe = Cqe()
+        io_uring_queue_init(entries, self._ring)
+        try:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            io_uring_queue_exit(self._ring)
+            raise
+
+    def write(self, data):
+        if not data:
+            return 0
+        if len(self._pending) == self.entries:
+            self.flush()
+
+        sqe = io_uring_get_sqe(self._ring)
+        io_uring_prep_write(sqe, self._fd, data, self.offset)
+        self._pending.append((self.offset, data))
+        self.offset += len(data)
+        return len(data)
+
+    def flush(self):
+        """Submit queued writes and wait for all of them to complete"""
+        if not self._pending:
+            return
+
+        io_uring_submit(self._ring)
+        results = []
+        while len(results) < len(self._pending):
+            io_uring_wait_cqe(self._ring, self._cqe)
+            ready = io_uring_cq_ready(self._ring)
+            results.extend(self._cqe[i].res for i in range(ready))
+            io_uring_cq_advance(self._ring, ready)
+
+        # Writes to one file can complete out of order, so check the total
+        # and fall back to pwrite for the rare short write.
+        pending, self._pending = self._pending, []
+        errors = [res for res in results if res < 0]
+        if errors:
+            raise OSError(-errors[0], os.strerror(-errors[0]))
+        if sum(results) != sum(len(data) for _, data in pending):
+            for offset, data in pending:
+                os.pwrite(self._fd, data, offset)
+
+    def close(self):
+        if self._fd is None:
+            return
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            io_uring_queue_exit(self._ring)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()